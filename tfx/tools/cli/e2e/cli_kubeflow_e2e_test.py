@@ -19,7 +19,9 @@ from __future__ import division
 from __future__ import print_function
 
 import codecs
+from concurrent import futures
 import datetime
+import functools
 import json
 import locale
 import logging
@@ -30,60 +32,204 @@ import string
 import subprocess
 import sys
 import tempfile
-from typing import Text
+from typing import Iterable, List, Optional, Text
 
 import absl
 from click import testing as click_testing
 import kfp
 import kfp_server_api
+from kubernetes import client as k8s_client
+from kubernetes import config as k8s_config
 import tensorflow as tf
 
 from google.cloud import storage
 from tensorflow.python.lib.io import file_io  # pylint: disable=g-direct-tensorflow-import
 from tfx.tools.cli import labels
 from tfx.tools.cli.cli_main import cli_group
+from tfx.tools.cli.handler import handler_factory
+
+
+_GCP_PROJECT_ID = 'tfx-oss-testing'
+_BUCKET_NAME = 'tfx-oss-testing-bucket'
+# Maximum number of GCS operations sent in a single batch request.
+_GCS_BATCH_SIZE = 100
+# Number of threads used to clean up pipelines on the KFP server.
+_CLEANUP_MAX_WORKERS = 16
+# Root for per-test temporary directories; tmpfs avoids disk latency.
+_TMP_ROOT = '/dev/shm' if os.path.isdir('/dev/shm') else None
+# Directory containing the original test DSL files.
+_TESTDATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'testdata')
+# Normalized name of the locale's preferred encoding.
+_PREFERRED_ENCODING = codecs.lookup(locale.getpreferredencoding()).name
+# DSL files compiled and uploaded once per suite, mapped to the pipeline name
+# used in each file.
+_PREBUILT_DSL_FILES = {
+    'test_pipeline_kubeflow_1.py': 'chicago_taxi_pipeline_kubeflow',
+    'test_pipeline_kubeflow_3.py': 'chicago_taxi_pipeline_kubeflow_v2',
+}
+
+
+@functools.lru_cache(maxsize=128)
+def _load_pipeline_id(kubeflow_home: Text, pipeline_name: Text) -> Text:
+  """Reads the pipeline id saved by the CLI for the named pipeline."""
+  # Path to pipeline_args.json .
+  pipeline_args_path = os.path.join(kubeflow_home, pipeline_name,
+                                    'pipeline_args.json')
+  # Get pipeline_id from pipeline_args.json
+  with open(pipeline_args_path, 'r') as f:
+    pipeline_args = json.load(f)
+  return pipeline_args[labels.PIPELINE_ID]
 
 
 class CliKubeflowEndToEndTest(tf.test.TestCase):
 
-  def _get_endpoint(self, config: Text) -> Text:
-    lines = config.decode('utf-8').split('\n')
-    for line in lines:
-      if line.endswith('googleusercontent.com'):
-        return line
+  @classmethod
+  def setUpClass(cls):
+    super(CliKubeflowEndToEndTest, cls).setUpClass()
 
-  def setUp(self):
-    super(CliKubeflowEndToEndTest, self).setUp()
-    random.seed(datetime.datetime.now())
-
-    # List of packages installed.
-    self._pip_list = str(subprocess.check_output(['pip', 'freeze', '--local']))
+    # List of packages installed, as seen by the CLI's engine detection.
+    cls._pip_list = handler_factory._get_installed_packages()  # pylint: disable=protected-access
 
     # Check if Kubeflow is installed before running E2E tests.
-    if labels.KUBEFLOW_PACKAGE_NAME not in self._pip_list:
+    if labels.KUBEFLOW_PACKAGE_NAME not in cls._pip_list:
       sys.exit('Kubeflow not installed.')
 
+    # Kubernetes API client shared by all tests.
+    k8s_config.load_kube_config()
+    cls._k8s_client = k8s_client.CoreV1Api()
+
+    # Endpoint URL, which does not change within a test run.
+    cls._endpoint = cls._k8s_client.read_namespaced_config_map(
+        'inverse-proxy-config', 'kubeflow').data['Hostname']
+    absl.logging.info('ENDPOINT: ' + cls._endpoint)
+
+    # Clients are shared by all tests so that their connections are reused.
+    cls._client = None
+    try:
+      # Create a kfp client for cleanup after running commands.
+      cls._client = kfp.Client(host=cls._endpoint)
+    except kfp_server_api.rest.ApiException as err:
+      absl.logging.info(err)
+    cls._storage_client = storage.Client(project=_GCP_PROJECT_ID)
+
     # Change the encoding for Click since Python 3 is configured to use ASCII as
     # encoding for the environment.
-    if codecs.lookup(locale.getpreferredencoding()).name == 'ascii':
+    if _PREFERRED_ENCODING == 'ascii':
       os.environ['LANG'] = 'en_US.utf-8'
 
-    # Initialize CLI runner.
-    self.runner = click_testing.CliRunner()
+    # CLI runner shared by all tests. Output and errors stay mixed since
+    # tests assert on messages written to stderr by sys.exit.
+    cls._runner = click_testing.CliRunner()
+
+    # Paths of DSL files used without modification, same for every test.
+    cls._pipeline_paths = {
+        'flink': os.path.join(_TESTDATA_DIR, 'test_pipeline_flink.py'),
+        'airflow1': os.path.join(_TESTDATA_DIR, 'test_pipeline_airflow_1.py'),
+    }
+
+    cls._prebuild_pipelines()
+
+  @classmethod
+  def tearDownClass(cls):
+    super(CliKubeflowEndToEndTest, cls).tearDownClass()
+    cls._cleanup_kfp_server(cls._prebuilt_home)
+    cls._prebuilt_dir.cleanup()
+
+  @classmethod
+  def _generate_pipeline_name(cls) -> Text:
+    return 'cli-kubeflow-e2e-test-%s-%s' % (
+        datetime.datetime.now().strftime('%s'), ''.join([
+            random.choice(string.ascii_lowercase + string.digits)
+            for _ in range(10)
+        ]))
+
+  @classmethod
+  def _prebuild_pipelines(cls) -> None:
+    """Creates the pipelines shared by tests which do not modify them.
+
+    Pipelines are created in a separate KUBEFLOW_HOME and are deleted in
+    tearDownClass. Tests get a copy of the handler files via _use_prebuilt.
+    """
+    random.seed(datetime.datetime.now())
+    cls._prebuilt_dir = tempfile.TemporaryDirectory(dir=_TMP_ROOT)
+    cls._prebuilt_home = os.path.join(cls._prebuilt_dir.name,
+                                      'CLI_Kubeflow_Pipelines')
+    os.makedirs(cls._prebuilt_home, exist_ok=True)
+    shared_name = cls._generate_pipeline_name() + '-shared'
+
+    cls._prebuilt_pipelines = {}
+    try:
+      olddir = os.getcwd()
+      # The compiled package is written to the current directory.
+      os.chdir(cls._prebuilt_home)
+      try:
+        for index, (filename, origin_pipeline_name) in enumerate(
+            sorted(_PREBUILT_DSL_FILES.items())):
+          pipeline_name = '{}-{}'.format(shared_name, index)
+          cls._change_pipeline_name(filename, _TESTDATA_DIR,
+                                    cls._prebuilt_dir.name,
+                                    origin_pipeline_name, pipeline_name)
+          result = cls._runner.invoke(
+              cli_group, [
+                  'pipeline', 'create', '--engine', 'kubeflow',
+                  '--pipeline_path',
+                  os.path.join(cls._prebuilt_dir.name, filename),
+                  '--endpoint', cls._endpoint
+              ],
+              env={'KUBEFLOW_HOME': cls._prebuilt_home})
+          if ('Pipeline "{}" created successfully.'.format(pipeline_name)
+              not in result.output):
+            raise RuntimeError('Failed to create pipeline {}: {}'.format(
+                pipeline_name, result.output))
+          cls._prebuilt_pipelines[filename] = pipeline_name
+      finally:
+        os.chdir(olddir)
+    except BaseException:
+      # tearDownClass is not run when setUpClass fails, so remove any pipeline
+      # already created here before propagating the error.
+      try:
+        cls._cleanup_kfp_server(cls._prebuilt_home)
+      except Exception as err:  # pylint: disable=broad-except
+        absl.logging.error(
+            'Failed to clean up prebuilt pipelines: {}'.format(err))
+      cls._prebuilt_dir.cleanup()
+      raise
+
+  def _use_prebuilt(self, filename: Text) -> Text:
+    """Copies a prebuilt pipeline into the test's KUBEFLOW_HOME.
+
+    Args:
+      filename: The DSL file the pipeline was created from.
+
+    Returns:
+      The name of the prebuilt pipeline.
+    """
+    pipeline_name = self._prebuilt_pipelines[filename]
+    shutil.copytree(
+        os.path.join(self._prebuilt_home, pipeline_name),
+        os.path.join(self._kubeflow_home, pipeline_name))
+    shutil.copy(
+        os.path.join(self._prebuilt_home, '{}.tar.gz'.format(pipeline_name)),
+        self._kubeflow_home)
+    self._used_prebuilt_pipelines.add(pipeline_name)
+    return pipeline_name
+
+  def setUp(self):
+    super(CliKubeflowEndToEndTest, self).setUp()
+    random.seed(datetime.datetime.now())
+
+    # CLI runner.
+    self.runner = type(self)._runner
 
     # Testdata path.
-    self._testdata_dir = os.path.join(
-        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'testdata')
+    self._testdata_dir = _TESTDATA_DIR
     self._testdata_dir_updated = os.path.join(
         os.environ.get('TEST_UNDECLARED_OUTPUTS_DIR', self.get_temp_dir()),
         self._testMethodName)
     tf.io.gfile.makedirs(self._testdata_dir_updated)
 
-    self._pipeline_name = 'cli-kubeflow-e2e-test-%s-%s' % (
-        datetime.datetime.now().strftime('%s'), ''.join([
-            random.choice(string.ascii_lowercase + string.digits)
-            for _ in range(10)
-        ]))
+    self._pipeline_name = self._generate_pipeline_name()
     absl.logging.info('Pipeline name is %s' % self._pipeline_name)
     self._pipeline_name_v2 = self._pipeline_name + '_v2'
 
@@ -102,46 +248,60 @@ class CliKubeflowEndToEndTest(tf.test.TestCase):
 
     self._pipeline_path = os.path.join(self._testdata_dir_updated,
                                        'test_pipeline_kubeflow_1.py')
-    self.assertTrue(tf.io.gfile.exists(self._pipeline_path))
+    self.assertTrue(os.path.exists(self._pipeline_path))
     self._pipeline_path_updated = os.path.join(self._testdata_dir_updated,
                                                'test_pipeline_kubeflow_2.py')
-    self.assertTrue(tf.io.gfile.exists(self._pipeline_path_updated))
+    self.assertTrue(os.path.exists(self._pipeline_path_updated))
     self._pipeline_path_v2 = os.path.join(self._testdata_dir_updated,
                                           'test_pipeline_kubeflow_3.py')
-    self.assertTrue(tf.io.gfile.exists(self._pipeline_path_v2))
+    self.assertTrue(os.path.exists(self._pipeline_path_v2))
 
     # Endpoint URL
-    self._endpoint = self._get_endpoint(
-        subprocess.check_output(
-            'kubectl describe configmap inverse-proxy-config -n kubeflow'.split(
-                )))
-    absl.logging.info('ENDPOINT: ' + self._endpoint)
+    self._endpoint = type(self)._endpoint
 
     # Change home directories
     self._olddir = os.getcwd()
     self._old_kubeflow_home = os.environ.get('KUBEFLOW_HOME')
-    os.environ['KUBEFLOW_HOME'] = os.path.join(tempfile.mkdtemp(),
+    # Keep the handler home on tmpfs when available.
+    self._tmp_dir = tempfile.TemporaryDirectory(dir=_TMP_ROOT)
+    os.environ['KUBEFLOW_HOME'] = os.path.join(self._tmp_dir.name,
                                                'CLI_Kubeflow_Pipelines')
     self._kubeflow_home = os.environ['KUBEFLOW_HOME']
-    tf.io.gfile.makedirs(self._kubeflow_home)
+    os.makedirs(self._kubeflow_home, exist_ok=True)
     os.chdir(self._kubeflow_home)
+    self._handler_pipeline_path = os.path.join(self._kubeflow_home,
+                                               self._pipeline_name)
 
-    try:
-      # Create a kfp client for cleanup after running commands.
-      self._client = kfp.Client(host=self._endpoint)
-    except kfp_server_api.rest.ApiException as err:
-      absl.logging.info(err)
+    self._client = type(self)._client
+    # Prebuilt pipelines whose runs and their results are deleted in tearDown.
+    self._used_prebuilt_pipelines = set()
 
   def tearDown(self):
     super(CliKubeflowEndToEndTest, self).tearDown()
-    self._cleanup_kfp_server()
-    if self._old_kubeflow_home:
-      os.environ['KUBEFLOW_HOME'] = self._old_kubeflow_home
-    os.chdir(self._olddir)
-    shutil.rmtree(self._kubeflow_home)
+    try:
+      # Prebuilt pipelines are shared with other tests, so they are kept and
+      # only what their runs produced is deleted here.
+      for pipeline_name in self._used_prebuilt_pipelines:
+        experiment = self._client.get_experiment(experiment_name=pipeline_name)
+        if experiment:
+          self._delete_all_runs(experiment.id)
+        self._delete_pipeline_output(pipeline_name)
+      if self._used_prebuilt_pipelines:
+        self._drop_databases([
+            self._get_mlmd_db_name(name)
+            for name in self._used_prebuilt_pipelines
+        ])
+      self._cleanup_kfp_server(
+          self._kubeflow_home, skip=self._prebuilt_pipelines.values())
+    finally:
+      if self._old_kubeflow_home:
+        os.environ['KUBEFLOW_HOME'] = self._old_kubeflow_home
+      os.chdir(self._olddir)
+      self._tmp_dir.cleanup()
     absl.logging.info('Deleted all runs.')
 
-  def _change_pipeline_name(self, filename: Text, origin_dsl_dir: Text,
+  @classmethod
+  def _change_pipeline_name(cls, filename: Text, origin_dsl_dir: Text,
                             new_dsl_dir: Text, origin_pipeline_name: Text,
                             new_pipeline_name: Text) -> None:
     """Copy pipeline file to new dir with pipeline name changed."""
@@ -152,109 +312,165 @@ class CliKubeflowEndToEndTest(tf.test.TestCase):
     contents = contents.replace(origin_pipeline_name, new_pipeline_name)
     file_io.write_string_to_file(os.path.join(new_dsl_dir, filename), contents)
 
-  def _cleanup_kfp_server(self):
-    pipelines = tf.io.gfile.listdir(self._kubeflow_home)
-    for pipeline_name in pipelines:
-      if tf.io.gfile.isdir(pipeline_name):
-        self._delete_experiment(pipeline_name)
-        self._delete_pipeline(pipeline_name)
-        self._delete_pipeline_output(pipeline_name)
-        self._delete_pipeline_metadata(pipeline_name)
-
-  def _delete_pipeline(self, pipeline_name: Text):
-    pipeline_id = self._get_pipeline_id(pipeline_name)
-    if self._client._pipelines_api.get_pipeline(pipeline_id):
-      self._client._pipelines_api.delete_pipeline(id=pipeline_id)
+  @classmethod
+  def _cleanup_kfp_server(cls,
+                          kubeflow_home: Text,
+                          skip: Iterable[Text] = ()) -> None:
+    skip = frozenset(skip)
+    pipelines = [
+        entry.name for entry in os.scandir(kubeflow_home)
+        if entry.is_dir(follow_symlinks=False) and entry.name not in skip
+    ]
+    with futures.ThreadPoolExecutor(
+        max_workers=_CLEANUP_MAX_WORKERS) as executor:
+      # Runs must be gone before the pipelines they were started from.
+      for pipeline_name in pipelines:
+        cls._delete_experiment(pipeline_name, executor=executor)
+      pipeline_futures = [
+          executor.submit(cls._delete_pipeline, kubeflow_home, pipeline_name)
+          for pipeline_name in pipelines
+      ]
+      # Output is deleted from this thread while the pool deletes pipelines,
+      # since an open batch on the shared storage client would also capture
+      # requests made by other threads.
+      for pipeline_name in pipelines:
+        cls._delete_pipeline_output(pipeline_name)
+      for future in futures.as_completed(pipeline_futures):
+        future.result()
+    # Metadata is dropped once nothing that writes to it is left.
+    if pipelines:
+      cls._drop_databases(
+          [cls._get_mlmd_db_name(name) for name in pipelines])
+    # Pipeline ids of deleted pipelines must not leak into later tests.
+    _load_pipeline_id.cache_clear()
+
+  @classmethod
+  def _delete_pipeline(cls, kubeflow_home: Text, pipeline_name: Text):
+    pipeline_id = _load_pipeline_id(kubeflow_home, pipeline_name)
+    try:
+      cls._client._pipelines_api.delete_pipeline(id=pipeline_id)
       absl.logging.info('Deleted pipeline : {}'.format(pipeline_name))
-
-  def _delete_experiment(self, pipeline_name: Text):
-    if self._client.get_experiment(experiment_name=pipeline_name):
-      experiment_id = self._client.get_experiment(
-          experiment_name=pipeline_name).id
-      self._delete_all_runs(experiment_id)
-      self._client._experiment_api.delete_experiment(experiment_id)
+    except kfp_server_api.rest.ApiException as err:
+      # The pipeline is already gone.
+      if err.status != 404:
+        raise
+
+  @classmethod
+  def _delete_experiment(
+      cls,
+      pipeline_name: Text,
+      executor: Optional[futures.Executor] = None) -> None:
+    experiment = cls._client.get_experiment(experiment_name=pipeline_name)
+    if experiment:
+      experiment_id = experiment.id
+      cls._delete_all_runs(experiment_id, executor=executor)
+      cls._client._experiment_api.delete_experiment(experiment_id)
       absl.logging.info('Deleted experiment : {}'.format(pipeline_name))
 
   def _get_pipeline_id(self, pipeline_name: Text) -> Text:
-    # Path to pipeline_args.json .
-    pipeline_args_path = os.path.join(self._kubeflow_home, pipeline_name,
-                                      'pipeline_args.json')
-    # Get pipeline_id from pipeline_args.json
-    with open(pipeline_args_path, 'r') as f:
-      pipeline_args = json.load(f)
-    pipeline_id = pipeline_args[labels.PIPELINE_ID]
-    return pipeline_id
-
-  def _delete_pipeline_output(self, pipeline_name: Text) -> None:
+    return _load_pipeline_id(self._kubeflow_home, pipeline_name)
+
+  @classmethod
+  def _delete_pipeline_output(cls, pipeline_name: Text) -> None:
     """Deletes output produced by the named pipeline.
 
     Args:
       pipeline_name: The name of the pipeline.
     """
-    gcp_project_id = 'tfx-oss-testing'
-    bucket_name = 'tfx-oss-testing-bucket'
-    client = storage.Client(project=gcp_project_id)
-    bucket = client.get_bucket(bucket_name)
     prefix = 'test_output/{}'.format(pipeline_name)
+    bucket = cls._storage_client.get_bucket(_BUCKET_NAME)
     absl.logging.info(
         'Deleting output under GCS bucket prefix: {}'.format(prefix))
-    blobs = bucket.list_blobs(prefix=prefix)
-    bucket.delete_blobs(blobs)
-
-  def _get_mysql_pod_name(self) -> Text:
+    blobs = list(bucket.list_blobs(prefix=prefix))
+    for i in range(0, len(blobs), _GCS_BATCH_SIZE):
+      with cls._storage_client.batch():
+        for blob in blobs[i:i + _GCS_BATCH_SIZE]:
+          blob.delete()
+
+  @classmethod
+  @functools.lru_cache(maxsize=1)
+  def _get_mysql_pod_name(cls) -> Text:
     """Returns MySQL pod name in the cluster."""
-    pod_name = subprocess.check_output([
-        'kubectl',
-        '-n',
-        'kubeflow',
-        'get',
-        'pods',
-        '-l',
-        'app=mysql',
-        '--no-headers',
-        '-o',
-        'custom-columns=:metadata.name',
-    ]).decode('utf-8').strip('\n')
+    pod_name = cls._k8s_client.list_namespaced_pod(
+        'kubeflow', label_selector='app=mysql').items[0].metadata.name
     absl.logging.info('MySQL pod name is: {}'.format(pod_name))
     return pod_name
 
-  def _delete_pipeline_metadata(self, pipeline_name: Text) -> None:
-    """Drops the database containing metadata produced by the pipeline.
+  @classmethod
+  def _get_mlmd_db_name(cls, pipeline_name: Text) -> Text:
+    # MySQL DB names must not contain '-' while k8s names must not contain '_'.
+    # So we replace the dashes here for the DB name.
+    valid_mysql_name = pipeline_name.replace('-', '_')
+    # MySQL database name cannot exceed 64 characters.
+    return 'mlmd_{}'.format(valid_mysql_name[-59:])
+
+  @classmethod
+  def _drop_databases(cls, db_names: List[Text]) -> None:
+    """Drops the databases containing metadata produced by pipelines.
+
+    All statements are sent through a single `kubectl exec` session.
 
     Args:
-      pipeline_name: The name of the pipeline owning the database.
+      db_names: Names of the MLMD databases to drop.
     """
-    pod_name = self._get_mysql_pod_name()
-    valid_mysql_name = pipeline_name.replace('-', '_')
-    # MySQL database name cannot exceed 64 characters.
-    db_name = 'mlmd_{}'.format(valid_mysql_name[-59:])
+    pod_name = cls._get_mysql_pod_name()
+    statements = ' '.join(
+        'drop database if exists {};'.format(db_name) for db_name in db_names)
 
     command = [
         'kubectl',
         '-n',
         'kubeflow',
         'exec',
-        '-it',
         pod_name,
         '--',
         'mysql',
         '--user',
         'root',
         '--execute',
-        'drop database if exists {};'.format(db_name),
+        statements,
     ]
-    absl.logging.info('Dropping MLMD DB with name: {}'.format(db_name))
+    absl.logging.info('Dropping MLMD DBs with names: {}'.format(db_names))
     subprocess.run(command, check=True)
 
-  def _delete_all_runs(self, experiment_id: Text):
+  @classmethod
+  def _delete_all_runs(
+      cls,
+      experiment_id: Text,
+      executor: Optional[futures.Executor] = None) -> None:
+    """Deletes all runs of an experiment.
+
+    A failed deletion is logged and does not stop the others.
+
+    Args:
+      experiment_id: The id of the experiment.
+      executor: Executor to delete the runs concurrently with. Runs are
+        deleted one by one if not given.
+    """
     try:
       # Get all runs related to the experiment_id.
-      response = self._client.list_runs(experiment_id=experiment_id)
-      if response and response.runs:
-        for run in response.runs:
-          self._client._run_api.delete_run(id=run.id)
+      response = cls._client.list_runs(experiment_id=experiment_id)
     except kfp_server_api.rest.ApiException as err:
       absl.logging.info(err)
+      return
+    if not (response and response.runs):
+      return
+    if executor is None:
+      for run in response.runs:
+        try:
+          cls._client._run_api.delete_run(id=run.id)
+        except kfp_server_api.rest.ApiException as err:
+          absl.logging.info(err)
+      return
+    delete_futures = [
+        executor.submit(cls._client._run_api.delete_run, id=run.id)
+        for run in response.runs
+    ]
+    for future in futures.as_completed(delete_futures):
+      try:
+        future.result()
+      except kfp_server_api.rest.ApiException as err:
+        absl.logging.info(err)
 
   def _valid_create_and_check(self, pipeline_path: Text,
                               pipeline_name: Text) -> None:
@@ -267,9 +483,9 @@ class CliKubeflowEndToEndTest(tf.test.TestCase):
     ])
     self.assertIn('CLI', result.output)
     self.assertIn('Creating pipeline', result.output)
-    self.assertTrue(tf.io.gfile.exists(pipeline_package_path))
+    self.assertTrue(os.path.exists(pipeline_package_path))
     self.assertTrue(
-        tf.io.gfile.exists(
+        os.path.exists(
             os.path.join(handler_pipeline_path, 'pipeline_args.json')))
     self.assertIn('Pipeline "{}" created successfully.'.format(pipeline_name),
                   result.output)
@@ -305,8 +521,7 @@ class CliKubeflowEndToEndTest(tf.test.TestCase):
                     result.output)
 
   def testPipelineUpdate(self):
-    handler_pipeline_path = os.path.join(self._kubeflow_home,
-                                         self._pipeline_name)
+    handler_pipeline_path = self._handler_pipeline_path
 
     # Try pipeline update when pipeline does not exist.
     result = self.runner.invoke(cli_group, [
@@ -317,7 +532,7 @@ class CliKubeflowEndToEndTest(tf.test.TestCase):
     self.assertIn('Updating pipeline', result.output)
     self.assertIn('Pipeline "{}" does not exist.'.format(self._pipeline_name),
                   result.output)
-    self.assertFalse(tf.io.gfile.exists(handler_pipeline_path))
+    self.assertFalse(os.path.exists(handler_pipeline_path))
 
     # Now update an existing pipeline.
     self._valid_create_and_check(self._pipeline_path, self._pipeline_name)
@@ -332,13 +547,13 @@ class CliKubeflowEndToEndTest(tf.test.TestCase):
         'Pipeline "{}" updated successfully.'.format(self._pipeline_name),
         result.output)
     self.assertTrue(
-        tf.io.gfile.exists(
+        os.path.exists(
             os.path.join(handler_pipeline_path, 'pipeline_args.json')))
 
   def testPipelineCompile(self):
 
     # Invalid DSL path
-    pipeline_path = os.path.join(self._testdata_dir, 'test_pipeline_flink.py')
+    pipeline_path = self._pipeline_paths['flink']
     result = self.runner.invoke(cli_group, [
         'pipeline', 'compile', '--engine', 'kubeflow', '--pipeline_path',
         pipeline_path
@@ -349,8 +564,7 @@ class CliKubeflowEndToEndTest(tf.test.TestCase):
                   result.output)
 
     # Wrong Runner.
-    pipeline_path = os.path.join(self._testdata_dir,
-                                 'test_pipeline_airflow_1.py')
+    pipeline_path = self._pipeline_paths['airflow1']
     result = self.runner.invoke(cli_group, [
         'pipeline', 'compile', '--engine', 'kubeflow', '--pipeline_path',
         pipeline_path
@@ -369,8 +583,7 @@ class CliKubeflowEndToEndTest(tf.test.TestCase):
     self.assertIn('Pipeline compiled successfully', result.output)
 
   def testPipelineDelete(self):
-    handler_pipeline_path = os.path.join(self._kubeflow_home,
-                                         self._pipeline_name)
+    handler_pipeline_path = self._handler_pipeline_path
 
     # Try deleting a non existent pipeline.
     result = self.runner.invoke(cli_group, [
@@ -381,7 +594,7 @@ class CliKubeflowEndToEndTest(tf.test.TestCase):
     self.assertIn('Deleting pipeline', result.output)
     self.assertIn('Pipeline "{}" does not exist.'.format(self._pipeline_name),
                   result.output)
-    self.assertFalse(tf.io.gfile.exists(handler_pipeline_path))
+    self.assertFalse(os.path.exists(handler_pipeline_path))
 
     # Create a pipeline.
     self._valid_create_and_check(self._pipeline_path, self._pipeline_name)
@@ -393,15 +606,15 @@ class CliKubeflowEndToEndTest(tf.test.TestCase):
     ])
     self.assertIn('CLI', result.output)
     self.assertIn('Deleting pipeline', result.output)
-    self.assertFalse(tf.io.gfile.exists(handler_pipeline_path))
+    self.assertFalse(os.path.exists(handler_pipeline_path))
     self.assertIn(
         'Pipeline {} deleted successfully.'.format(self._pipeline_name),
         result.output)
 
   def testPipelineList(self):
-    # Create pipelines.
-    self._valid_create_and_check(self._pipeline_path, self._pipeline_name)
-    self._valid_create_and_check(self._pipeline_path_v2, self._pipeline_name_v2)
+    # Use pipelines created in setUpClass.
+    pipeline_name = self._use_prebuilt('test_pipeline_kubeflow_1.py')
+    pipeline_name_v2 = self._use_prebuilt('test_pipeline_kubeflow_3.py')
 
     # List pipelines.
     result = self.runner.invoke(cli_group, [
@@ -409,12 +622,11 @@ class CliKubeflowEndToEndTest(tf.test.TestCase):
     ])
     self.assertIn('CLI', result.output)
     self.assertIn('Listing all pipelines', result.output)
-    self.assertIn(self._pipeline_name, result.output)
-    self.assertIn(self._pipeline_name_v2, result.output)
+    self.assertIn(pipeline_name, result.output)
+    self.assertIn(pipeline_name_v2, result.output)
 
   def testPipelineCreateAutoDetect(self):
-    handler_pipeline_path = os.path.join(self._kubeflow_home,
-                                         self._pipeline_name)
+    handler_pipeline_path = self._handler_pipeline_path
     pipeline_package_path = os.path.join(
         self._kubeflow_home, '{}.tar.gz'.format(self._pipeline_name))
     result = self.runner.invoke(cli_group, [
@@ -423,14 +635,15 @@ class CliKubeflowEndToEndTest(tf.test.TestCase):
     ])
     self.assertIn('CLI', result.output)
     self.assertIn('Creating pipeline', result.output)
-    if labels.AIRFLOW_PACKAGE_NAME in self._pip_list and labels.KUBEFLOW_PACKAGE_NAME in self._pip_list:
+    if (labels.AIRFLOW_PACKAGE_NAME in self._pip_list and
+        labels.KUBEFLOW_PACKAGE_NAME in self._pip_list):
       self.assertIn(
           'Multiple orchestrators found. Choose one using --engine flag.',
           result.output)
     else:
-      self.assertTrue(tf.io.gfile.exists(pipeline_package_path))
+      self.assertTrue(os.path.exists(pipeline_package_path))
       self.assertTrue(
-          tf.io.gfile.exists(
+          os.path.exists(
               os.path.join(handler_pipeline_path, 'pipeline_args.json')))
       self.assertIn(
           'Pipeline "{}" created successfully.'.format(self._pipeline_name),
@@ -510,11 +723,11 @@ class CliKubeflowEndToEndTest(tf.test.TestCase):
                   result.output)
 
   def testRunDelete(self):
-    # Now create a pipeline.
-    self._valid_create_and_check(self._pipeline_path, self._pipeline_name)
+    # Use a pipeline created in setUpClass.
+    pipeline_name = self._use_prebuilt('test_pipeline_kubeflow_1.py')
 
     # Run pipeline using kfp client to get run_id.
-    run = self._run_pipeline_using_kfp_client(self._pipeline_name)
+    run = self._run_pipeline_using_kfp_client(pipeline_name)
 
     # Delete run.
     result = self.runner.invoke(cli_group, [
@@ -526,11 +739,11 @@ class CliKubeflowEndToEndTest(tf.test.TestCase):
     self.assertIn('Run deleted.', result.output)
 
   def testRunTerminate(self):
-    # Now create a pipeline.
-    self._valid_create_and_check(self._pipeline_path, self._pipeline_name)
+    # Use a pipeline created in setUpClass.
+    pipeline_name = self._use_prebuilt('test_pipeline_kubeflow_1.py')
 
     # Run pipeline using kfp client to get run_id.
-    run = self._run_pipeline_using_kfp_client(self._pipeline_name)
+    run = self._run_pipeline_using_kfp_client(pipeline_name)
 
     # Delete run.
     result = self.runner.invoke(cli_group, [
@@ -542,42 +755,42 @@ class CliKubeflowEndToEndTest(tf.test.TestCase):
     self.assertIn('Run terminated.', result.output)
 
   def testRunStatus(self):
-    # Now create a pipeline.
-    self._valid_create_and_check(self._pipeline_path, self._pipeline_name)
+    # Use a pipeline created in setUpClass.
+    pipeline_name = self._use_prebuilt('test_pipeline_kubeflow_1.py')
 
     # Run pipeline using kfp client to get run_id.
-    run = self._run_pipeline_using_kfp_client(self._pipeline_name)
+    run = self._run_pipeline_using_kfp_client(pipeline_name)
 
     # Delete run.
     result = self.runner.invoke(cli_group, [
         'run', 'status', '--engine', 'kubeflow', '--pipeline_name',
-        self._pipeline_name, '--endpoint', self._endpoint, '--run_id', run.id
+        pipeline_name, '--endpoint', self._endpoint, '--run_id', run.id
     ])
     self.assertIn('CLI', result.output)
     self.assertIn('Retrieving run status.', result.output)
     self.assertIn(str(run.id), result.output)
-    self.assertIn(self._pipeline_name, result.output)
+    self.assertIn(pipeline_name, result.output)
 
   def testRunList(self):
-    # Now create a pipeline.
-    self._valid_create_and_check(self._pipeline_path, self._pipeline_name)
+    # Use a pipeline created in setUpClass.
+    pipeline_name = self._use_prebuilt('test_pipeline_kubeflow_1.py')
 
     # Run pipeline using kfp client to get run_id.
-    run_1 = self._run_pipeline_using_kfp_client(self._pipeline_name)
-    run_2 = self._run_pipeline_using_kfp_client(self._pipeline_name)
+    run_1 = self._run_pipeline_using_kfp_client(pipeline_name)
+    run_2 = self._run_pipeline_using_kfp_client(pipeline_name)
 
     # List runs.
     result = self.runner.invoke(cli_group, [
         'run', 'list', '--engine', 'kubeflow', '--pipeline_name',
-        self._pipeline_name, '--endpoint', self._endpoint
+        pipeline_name, '--endpoint', self._endpoint
     ])
     self.assertIn('CLI', result.output)
     self.assertIn(
-        'Listing all runs of pipeline: {}'.format(self._pipeline_name),
+        'Listing all runs of pipeline: {}'.format(pipeline_name),
         result.output)
     self.assertIn(str(run_1.id), result.output)
     self.assertIn(str(run_2.id), result.output)
-    self.assertIn(self._pipeline_name, result.output)
+    self.assertIn(pipeline_name, result.output)
 
 
 if __name__ == '__main__':
@@ -18,6 +18,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import functools
 import subprocess
 import sys
 from typing import Any, Dict, Text
@@ -28,6 +29,16 @@ from tfx.tools.cli import labels
 from tfx.tools.cli.handler import base_handler
 
 
+@functools.lru_cache(maxsize=1)
+def _get_installed_packages() -> Text:
+  """Returns the packages in the local environment as listed by pip.
+
+  The result is cached since listing packages spawns pip, and the CLI may
+  create several handlers within one process.
+  """
+  return subprocess.check_output(['pip', 'freeze', '--local']).decode('utf-8')
+
+
 def detect_handler(flags_dict: Dict[Text, Any]) -> base_handler.BaseHandler:
   """Detect handler from the environment.
 
@@ -44,7 +55,7 @@ def detect_handler(flags_dict: Dict[Text, Any]) -> base_handler.BaseHandler:
   Returns:
     Corrosponding Handler object.
   """
-  packages_list = str(subprocess.check_output(['pip', 'freeze', '--local']))
+  packages_list = _get_installed_packages()
   if labels.AIRFLOW_PACKAGE_NAME in packages_list and labels.KUBEFLOW_PACKAGE_NAME in packages_list:
     sys.exit('Multiple orchestrators found. Choose one using --engine flag.')
   if labels.AIRFLOW_PACKAGE_NAME in packages_list:
@@ -81,14 +92,13 @@ def create_handler(flags_dict: Dict[Text, Any]) -> base_handler.BaseHandler:
     Corresponding Handler object.
   """
   engine = flags_dict[labels.ENGINE_FLAG]
-  packages_list = str(subprocess.check_output(['pip', 'freeze', '--local']))
   if engine == 'airflow':
-    if labels.AIRFLOW_PACKAGE_NAME not in packages_list:
+    if labels.AIRFLOW_PACKAGE_NAME not in _get_installed_packages():
       sys.exit('Airflow not found.')
     from tfx.tools.cli.handler import airflow_handler  # pylint: disable=g-import-not-at-top
     return airflow_handler.AirflowHandler(flags_dict)
   elif engine == 'kubeflow':
-    if labels.KUBEFLOW_PACKAGE_NAME not in packages_list:
+    if labels.KUBEFLOW_PACKAGE_NAME not in _get_installed_packages():
       sys.exit('Kubeflow not found.')
     from tfx.tools.cli.handler import kubeflow_handler  # pylint: disable=g-import-not-at-top
     return kubeflow_handler.KubeflowHandler(flags_dict)
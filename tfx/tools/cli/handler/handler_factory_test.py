@@ -45,6 +45,7 @@ class HandlerFactoryTest(tf.test.TestCase):
     self.flags_dict = {}
     sys.modules['kfp'] = mock.Mock()
     sys.modules['kfp_server_api'] = mock.Mock()
+    handler_factory._get_installed_packages.cache_clear()
 
   def _MockSubprocessAirflow(self):
     return b'absl-py==0.7.1\nalembic==0.9.10\napache-beam==2.12.0\napache-airflow==1.10.3\n'
@@ -73,6 +74,15 @@ class HandlerFactoryTest(tf.test.TestCase):
         handler_factory.create_handler(flags_dict),
         kubeflow_handler.KubeflowHandler)
 
+  @mock.patch('subprocess.check_output')
+  def testInstalledPackagesCached(self, mock_check_output):
+    mock_check_output.return_value = (
+        b'absl-py==0.7.1\napache-airflow==1.10.3\n')
+    self.flags_dict[labels.ENGINE_FLAG] = 'airflow'
+    handler_factory.create_handler(self.flags_dict)
+    handler_factory.create_handler(self.flags_dict)
+    mock_check_output.assert_called_once()
+
   def testCreateHandlerBeam(self):
     self.flags_dict[labels.ENGINE_FLAG] = 'beam'
     self.assertIsInstance(
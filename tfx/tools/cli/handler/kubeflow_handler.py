@@ -113,9 +113,9 @@ class KubeflowHandler(base_handler.BaseHandler):
     """Delete pipeline in Kubeflow."""
 
     pipeline_name = self.flags_dict[labels.PIPELINE_NAME]
-    # Check if pipeline exists on server.
+    # Check if pipeline exists locally. A pipeline missing on the server makes
+    # the delete request below fail, so it is not probed separately.
     pipeline_id = self._get_pipeline_id(pipeline_name)
-    self._client._pipelines_api.get_pipeline(pipeline_id)  # pylint: disable=protected-access
 
     # Delete pipeline for kfp server.
     self._client._pipelines_api.delete_pipeline(id=pipeline_id)  # pylint: disable=protected-access
@@ -24,6 +24,7 @@ import enum
 import importlib
 import json
 import os
+import types
 from typing import Any, Dict, Optional, Text
 
 import absl
@@ -164,6 +165,18 @@ class Artifact(json_utils.Jsonable):
 
   @classmethod
   def _construct_artifact_type(cls):
+    # The validated type is built once per class. Each instance gets its own
+    # copy since the type proto is updated in place, e.g. when registered.
+    template = cls.__dict__.get('_artifact_type_template')
+    if template is None:
+      template = cls._build_artifact_type()
+      cls._artifact_type_template = template
+    artifact_type = metadata_store_pb2.ArtifactType()
+    artifact_type.CopyFrom(template)
+    return artifact_type
+
+  @classmethod
+  def _build_artifact_type(cls):
     type_name = cls.TYPE_NAME
     if not (type_name and isinstance(type_name, (str, Text))):
       raise ValueError(
@@ -174,7 +187,7 @@ class Artifact(json_utils.Jsonable):
     artifact_type.name = type_name
     if cls.PROPERTIES:
       # Perform validation on PROPERTIES dictionary.
-      if not isinstance(cls.PROPERTIES, dict):
+      if not isinstance(cls.PROPERTIES, (dict, types.MappingProxyType)):
         raise ValueError(
             'Artifact subclass %s.PROPERTIES is not a dictionary.' % cls)
       for key, value in cls.PROPERTIES.items():
@@ -19,6 +19,7 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 import os
+import types
 from typing import Text
 # Standard Imports
 import absl
@@ -188,6 +189,25 @@ class ArtifactTest(tf.test.TestCase):
                                  "Artifact has no property 'invalid'"):
       my_artifact.invalid  # pylint: disable=pointless-statement
 
+  def testReadOnlyProperties(self):
+
+    class MyReadOnlyArtifact(artifact.Artifact):
+      TYPE_NAME = 'MyReadOnlyType'
+      PROPERTIES = types.MappingProxyType(
+          {'int1': artifact.Property(type=artifact.PropertyType.INT)})
+
+    my_artifact = MyReadOnlyArtifact()
+    my_artifact.int1 = 111
+    self.assertEqual(111, my_artifact.int1)
+
+  def testArtifactTypeNotShared(self):
+    first = _MyArtifact()
+    second = _MyArtifact()
+    self.assertEqual(first.artifact_type, second.artifact_type)
+    first.artifact_type.id = 1
+    self.assertEqual(0, second.artifact_type.id)
+    self.assertEqual(0, _MyArtifact().artifact_type.id)
+
   def testStringTypeNameNotAllowed(self):
     with self.assertRaisesRegexp(
         ValueError,
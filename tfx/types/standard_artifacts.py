@@ -21,6 +21,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import types
 from typing import Text
 
 from tfx.types.artifact import Artifact
@@ -36,28 +37,29 @@ SPLIT_NAMES_PROPERTY = Property(type=PropertyType.STRING)
 # Value for a string-typed artifact.
 STRING_VALUE_PROPERTY = Property(type=PropertyType.STRING)
 
+# Read-only PROPERTIES shared by artifact types with the same properties.
+_SPAN_PROPERTIES = types.MappingProxyType({
+    'span': SPAN_PROPERTY,
+})
+_SPAN_AND_SPLIT_NAMES_PROPERTIES = types.MappingProxyType({
+    'span': SPAN_PROPERTY,
+    'split_names': SPLIT_NAMES_PROPERTY,
+})
+
 
 class Examples(Artifact):
   TYPE_NAME = 'Examples'
-  PROPERTIES = {
-      'span': SPAN_PROPERTY,
-      'split_names': SPLIT_NAMES_PROPERTY,
-  }
+  PROPERTIES = _SPAN_AND_SPLIT_NAMES_PROPERTIES
 
 
 class ExampleAnomalies(Artifact):
   TYPE_NAME = 'ExampleAnomalies'
-  PROPERTIES = {
-      'span': SPAN_PROPERTY,
-  }
+  PROPERTIES = _SPAN_PROPERTIES
 
 
 class ExampleStatistics(Artifact):
   TYPE_NAME = 'ExampleStatistics'
-  PROPERTIES = {
-      'span': SPAN_PROPERTY,
-      'split_names': SPLIT_NAMES_PROPERTY,
-  }
+  PROPERTIES = _SPAN_AND_SPLIT_NAMES_PROPERTIES
 
 
 class ExternalArtifact(Artifact):